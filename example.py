@@ -1,13 +1,14 @@
+import numpy as np
 import pandas as pd
-from sonnixgres import create_connection, create_table, populate_table, display_results_as_table
+from sonnixgres import close_pool, create_connection, create_table, populate_table, display_results_as_table
 
 # Create a dummy DataFrame
 def create_dummy_data(num_rows, suffix):
+    # Build the shared "row{i}" prefix once and derive every column from it
+    base = np.char.add('row', np.arange(1, num_rows + 1).astype('U'))
     return pd.DataFrame({
-        'column1': [f'row{i}_data1_{suffix}' for i in range(1, num_rows + 1)],
-        'column2': [f'row{i}_data2_{suffix}' for i in range(1, num_rows + 1)],
-        'column3': [f'row{i}_data3_{suffix}' for i in range(1, num_rows + 1)]
-    })
+        f'column{n}': np.char.add(base, f'_data{n}_{suffix}') for n in (1, 2, 3)
+    }, copy=False)
 
 # Create a connection to the database
 connection = create_connection()
@@ -42,5 +43,6 @@ finally:
     # Close the database connection
     if connection is not None:
         connection.close()
+    close_pool()
 
     # Optional cleanup code can be added here to drop the test tables
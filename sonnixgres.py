@@ -1,23 +1,46 @@
+import functools
+import hashlib
+import io
 import os
+import re
 import logging
 import warnings
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, MetaData, inspect
+import struct
+import numpy as np
 import pandas as pd
 import psycopg2
-from psycopg2.extensions import AsIs
-from rich.console import Console
-from rich.logging import RichHandler
-from rich.table import Table
+import psycopg2.errors
+from psycopg2 import sql
+from psycopg2.extras import execute_batch, execute_values
+from psycopg2.pool import PoolError, ThreadedConnectionPool
 import threading
-import pickle
+from concurrent.futures import ThreadPoolExecutor
+import uuid
+import weakref
+from urllib.parse import quote
 # Load environment variables
 load_dotenv()
 
-class CustomRichHandler(RichHandler):
-    def __init__(self, console: Console = None, **kwargs):
-        super().__init__(console=console, **kwargs)
-        self.console = console or Console()
+@functools.lru_cache(maxsize=1)
+def _get_console():
+    # Shared by the log handler and display_results_as_table; rich is imported on first use
+    from rich.console import Console
+    return Console()
+
+class CustomRichHandler(logging.Handler):
+    """Prints log messages through a rich Console, which is only created on the first message."""
+
+    def __init__(self, console=None, level=logging.NOTSET, **kwargs):
+        # RichHandler options such as rich_tracebacks are accepted for compatibility and ignored
+        super().__init__(level)
+        self._console = console
+
+    @property
+    def console(self):
+        if self._console is None:
+            self._console = _get_console()
+        return self._console
 
     def emit(self, record: logging.LogRecord) -> None:
         message = self.format(record)
@@ -33,7 +56,7 @@ logging.basicConfig(
     level=log_level,
     format="%(message)s",
     datefmt="[%X]",
-    handlers=[CustomRichHandler(rich_tracebacks=True, show_time=False)]
+    handlers=[CustomRichHandler()]
 )
 
 logger = logging.getLogger("rich")
@@ -49,12 +72,60 @@ class PostgresCredentials:
         self.port = int(os.getenv('DB_PORT', 5432))
         self.schema = os.getenv('DB_SCHEMA', '')
         self.tables = os.getenv('DB_TABLES', '').split(',')
+
+@functools.lru_cache(maxsize=1)
+def _credentials() -> PostgresCredentials:
+    # Read the environment once and share the result
+    return PostgresCredentials()
+
+def reset_credentials() -> None:
+    """Re-read credentials from the environment on next use, e.g. after tests change it."""
+    _credentials.cache_clear()
+    close_pool()
         
-def create_sqlalchemy_engine():
-    credentials = PostgresCredentials()
-    db_url = f"postgresql+psycopg2://{credentials.user}:{credentials.password}@{credentials.host}:{credentials.port}/{credentials.database}"
+@functools.lru_cache(maxsize=8)
+def _engine_for(user, password, host, port, database):
+    from sqlalchemy import create_engine
+
+    # One engine (and connection pool) per set of credentials
+    db_url = f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{database}"
     return create_engine(db_url)
 
+def create_sqlalchemy_engine():
+    credentials = _credentials()
+    return _engine_for(credentials.user, credentials.password, credentials.host,
+                       credentials.port, credentials.database)
+
+def _pg_type_for(dtype):
+    """Map a pandas dtype to the PostgreSQL column type used when populating tables."""
+    if pd.api.types.is_bool_dtype(dtype):
+        return 'BOOLEAN'
+    if pd.api.types.is_integer_dtype(dtype):
+        return 'BIGINT'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'DOUBLE PRECISION'
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        # Keep the instant; TIMESTAMP would silently drop the UTC offset
+        return 'TIMESTAMP WITH TIME ZONE'
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'TIMESTAMP'
+    return 'TEXT'
+
+# Mapping SQLAlchemy types to SQL types, covering every type _pg_type_for produces
+SQL_TYPE_MAPPING = {
+    'INTEGER': 'INT',
+    'BIGINT': 'BIGINT',
+    'TEXT': 'TEXT',
+    'BOOLEAN': 'BOOLEAN',
+    'DATE': 'DATE',
+    'TIMESTAMP': 'TIMESTAMP',
+    'TIMESTAMP WITH TIME ZONE': 'TIMESTAMP WITH TIME ZONE',
+    'FLOAT': 'FLOAT',
+    'DOUBLE': 'DOUBLE PRECISION',
+    'DOUBLE PRECISION': 'DOUBLE PRECISION',
+    'SERIAL': 'SERIAL'
+}
+
 class MetadataCache:
     def __init__(self, schema, tables):
         self.schema = schema
@@ -64,19 +135,8 @@ class MetadataCache:
         self.lock = threading.Lock()
 
     def format_column_details(self, column):
-        # Mapping SQLAlchemy types to SQL types
-        sql_type_mapping = {
-            'INTEGER': 'INT',
-            'BIGINT': 'BIGINT',
-            'TEXT': 'VARCHAR(255)',
-            'BOOLEAN': 'BOOLEAN',
-            'DATE': 'DATE',
-            'FLOAT': 'FLOAT',
-            'DOUBLE': 'DOUBLE PRECISION',
-            'SERIAL': 'SERIAL'
-        }
         # Default to VARCHAR(255) if type not in mapping
-        sql_type = sql_type_mapping.get(str(column.type), 'VARCHAR(255)')
+        sql_type = SQL_TYPE_MAPPING.get(str(column.type), 'VARCHAR(255)')
         # Format column details for SQL
         details = f"{column.name} {sql_type}"
         if column.primary_key:
@@ -93,10 +153,13 @@ class MetadataCache:
         # Refreshes the metadata cache by reflecting the database schema
         with self.lock:
             try:
+                from sqlalchemy import MetaData
+
+                # Reflect every table in one pass so the catalog lookups are batched
                 metadata = MetaData()
-                for table in self.tables:
-                    metadata.reflect(bind=self.engine, only=[table], schema=self.schema)
-                
+                metadata.reflect(bind=self.engine, schema=self.schema,
+                                 only=[table for table in self.tables if table])
+
                 self.metadata_cache = metadata
                 logger.info("Metadata cache refreshed.")
 
@@ -107,6 +170,8 @@ class MetadataCache:
         columns_info = {}  # Use a dictionary to structure information by table
         with self.lock:
             try:
+                from sqlalchemy import inspect
+
                 inspector = inspect(self.engine)
                 for table_name in self.tables:
                     full_table_name = f"{self.schema}.{table_name}" if self.schema else table_name
@@ -135,40 +200,179 @@ class MetadataCache:
 class ConnectionError(Exception):
     """Exception raised when connection to database fails."""
 
-def _get_connection(credentials: PostgresCredentials):
-    try:
-        connection = psycopg2.connect(
-            host=credentials.host,
-            database=credentials.database,
-            user=credentials.user,
-            password=credentials.password,
-            port=credentials.port
-        )
+class PooledConnection(psycopg2.extensions.connection):
+    """A psycopg2 connection whose close() hands it back to the pool it was borrowed from."""
 
-        if credentials.schema:
-            with connection.cursor() as cursor:
-                cursor.execute("SET search_path TO %s", (credentials.schema,))
-            logger.info(f"Schema set to {credentials.schema}")
+    _pool = None
+    _borrowed = False
+
+    def _check_borrowed(self) -> None:
+        # The session may already be lent to another caller once close() has returned it
+        if not self._borrowed:
+            raise psycopg2.InterfaceError("connection already closed")
+
+    def cursor(self, *args, **kwargs):
+        self._check_borrowed()
+        return super().cursor(*args, **kwargs)
 
-        return connection
+    def commit(self) -> None:
+        self._check_borrowed()
+        super().commit()
+
+    def close(self) -> None:
+        if not self._borrowed:
+            # Idle in the pool already: closing again is a no-op unless the pool is gone
+            if self._pool is None or self._pool.closed:
+                super().close()
+            return
+        pool, self._pool, self._borrowed = self._pool, None, False
+        if pool.closed:
+            super().close()
+            return
+        pool.putconn(self, close=bool(self.closed))
+        if not self.closed:
+            self._pool = pool
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        # Commit or roll back like a plain psycopg2 connection, then return it to the pool
+        try:
+            super().__exit__(exc_type, exc_value, traceback)
+        finally:
+            self.close()
+
+class BlockingConnectionPool(ThreadedConnectionPool):
+    """A ThreadedConnectionPool that waits for a free connection and keeps every returned one open."""
+
+    def __init__(self, maxconn, timeout, *args, **kwargs):
+        super().__init__(1, maxconn, *args, **kwargs)
+        # putconn closes returned connections beyond minconn; keep them all, still opening them lazily
+        self.minconn = maxconn
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(maxconn)
+
+    def getconn(self, key=None):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolError(f"no connection was returned to the pool within {self.timeout} seconds")
+        try:
+            return super().getconn(key)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn=None, key=None, close=False):
+        super().putconn(conn, key, close)
+        self._slots.release()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _get_pool() -> ThreadedConnectionPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            credentials = _credentials()
+            try:
+                _pool = BlockingConnectionPool(
+                    int(os.getenv('DB_POOL_MAX', '10')), float(os.getenv('DB_POOL_TIMEOUT', '30')),
+                    host=credentials.host,
+                    database=credentials.database,
+                    user=credentials.user,
+                    password=credentials.password,
+                    port=credentials.port,
+                    connection_factory=PooledConnection,
+                    # Set the schema at connection startup so it survives rollbacks
+                    options=f"-c search_path={credentials.schema}" if credentials.schema else None
+                )
+            except (Exception, psycopg2.DatabaseError) as error:
+                logger.error(f"Error creating connection pool: {error}")
+                raise ConnectionError(error) from error
+            if credentials.schema:
+                logger.info(f"Schema set to {credentials.schema}")
+    return _pool
+
+def close_pool() -> None:
+    """Close every pooled connection; call this once at application exit."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            # Detach every connection so closeall() really closes them
+            for connection in [*_pool._pool, *_pool._used.values()]:
+                connection._pool = None
+                connection._borrowed = False
+            _pool.closeall()
+            _pool = None
+            logger.info("Connection pool closed.")
+
+def create_connection() -> psycopg2.connect:
+    pool = _get_pool()
+    try:
+        connection = pool.getconn()
     except (Exception, psycopg2.DatabaseError) as error:
         logger.error(f"Error getting connection: {error}")
         raise ConnectionError(error) from error
-
-def create_connection() -> psycopg2.connect:
-    credentials = PostgresCredentials()
-    return _get_connection(credentials)
+    connection._pool = pool
+    connection._borrowed = True
+    return connection
+
+QUERY_FETCH_SIZE = 10000
+# Queries that can run behind DECLARE ... CURSOR; anything else uses a client-side cursor
+SERVER_SIDE_QUERY = re.compile(r"\s*\(*\s*(SELECT|WITH|VALUES|TABLE)\b", re.IGNORECASE)
+
+def _fetch_dataframe(cursor) -> pd.DataFrame:
+    """Fetch the cursor's result in batches of QUERY_FETCH_SIZE rows into one DataFrame."""
+    frames = []
+    while True:
+        if cursor.description is None and not cursor.name:
+            # The statement returned no rows at all, e.g. an INSERT without RETURNING
+            return pd.DataFrame()
+        rows = cursor.fetchmany(QUERY_FETCH_SIZE)
+        columns = [column.name for column in cursor.description]
+        if not rows:
+            break
+        frames.append(pd.DataFrame.from_records(rows, columns=columns, coerce_float=True))
+
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames, ignore_index=True)
+
+def _server_side_query(connection, query, params):
+    """Stream a query through a named cursor, or return None when DECLARE rejects it."""
+    with connection.cursor() as cursor:
+        cursor.execute("SAVEPOINT sonnixgres_query")
+    try:
+        with connection.cursor(name=f"query_{uuid.uuid4().hex}") as cursor:
+            cursor.itersize = QUERY_FETCH_SIZE
+            cursor.execute(query, params)
+            df = _fetch_dataframe(cursor)
+    except (Exception, psycopg2.DatabaseError) as error:
+        with connection.cursor() as cursor:
+            cursor.execute("ROLLBACK TO SAVEPOINT sonnixgres_query")
+        if isinstance(error, (psycopg2.errors.SyntaxError, psycopg2.errors.FeatureNotSupported)):
+            return None
+        raise
+    with connection.cursor() as cursor:
+        cursor.execute("RELEASE SAVEPOINT sonnixgres_query")
+    return df
 
 def query_database(connection: psycopg2.connect, query: str, 
-                   params: tuple | None = None, close_connection: bool = True) -> pd.DataFrame:
+                   params: tuple | None = None, close_connection: bool = False) -> pd.DataFrame:
     if not connection:
         raise ConnectionError("No connection to database.")
 
     try:
-        df = pd.read_sql(query, connection, params=params)
+        df = None
+        if not connection.autocommit and SERVER_SIDE_QUERY.match(query):
+            df = _server_side_query(connection, query, params)
+        if df is None:
+            with connection.cursor() as cursor:
+                cursor.execute(query, params)
+                df = _fetch_dataframe(cursor)
         logger.info("Query executed successfully.")
         return df
     except (Exception, psycopg2.DatabaseError) as error:
+        connection.rollback()
         logger.error(f"Query execution error: {error}")
         raise
     finally:
@@ -176,6 +380,32 @@ def query_database(connection: psycopg2.connect, query: str,
             connection.close()
             logger.info("Database connection closed.")
 
+def query_database_arrow(query: str, uri: str | None = None) -> pd.DataFrame:
+    """Run a query with the ADBC PostgreSQL driver, falling back to query_database without it."""
+    try:
+        import adbc_driver_postgresql.dbapi as adbc_dbapi
+    except ImportError:
+        logger.warning("adbc_driver_postgresql is not installed, falling back to psycopg2.")
+        connection = psycopg2.connect(uri) if uri else create_connection()
+        return query_database(connection, query, close_connection=True)
+
+    if uri is None:
+        credentials = _credentials()
+        uri = (f"postgresql://{quote(credentials.user or '', safe='')}:{quote(credentials.password or '', safe='')}"
+               f"@{credentials.host}:{credentials.port}/{credentials.database}")
+        if credentials.schema:
+            uri += f"?options={quote(f'-c search_path={credentials.schema}', safe='')}"
+
+    try:
+        with adbc_dbapi.connect(uri) as connection, connection.cursor() as cursor:
+            cursor.execute(query)
+            df = cursor.fetch_arrow_table().to_pandas(self_destruct=True)
+        logger.info("Query executed successfully.")
+        return df
+    except Exception as error:
+        logger.error(f"Query execution error: {error}")
+        raise
+
 def save_results_to_csv(dataframe: pd.DataFrame, filename: str) -> None:
     try:
         dataframe.to_csv(filename, index=False)
@@ -185,33 +415,54 @@ def save_results_to_csv(dataframe: pd.DataFrame, filename: str) -> None:
         raise
 
 def display_results_as_table(dataframe: pd.DataFrame, max_column_width: int = 50) -> None:
-    console = Console()
+    from rich.table import Table
+
+    console = _get_console()
     display_limit = 50
 
-    if len(dataframe) > display_limit:
+    # Slice first so nothing below touches more than display_limit rows
+    limited_dataframe = dataframe.head(display_limit)
+    if len(limited_dataframe) == display_limit and len(dataframe) > display_limit:
         console.print(f"Data is too big! Displaying only the first [red]50[/red] rows. "
                       "To view all data, export it as a CSV using the included function: "
                       "'[green]save_results_to_csv[/green]'.", style="yellow")
-        limited_dataframe = dataframe.head(display_limit)
-    else:
-        limited_dataframe = dataframe
 
     table = Table(show_header=True, header_style="bold magenta")
     for col in limited_dataframe.columns:
         table.add_column(str(col), max_width=max_column_width)
 
-    for _, row in limited_dataframe.iterrows():
-        table.add_row(*[str(item) for item in row])
+    # Convert every cell to a string in one vectorized pass, then add plain rows
+    for row in limited_dataframe.astype(object).to_numpy().astype(str):
+        table.add_row(*row)
 
     console.print(table)
     
 
 
+# SQL templates composed once at import; identifiers are quoted into them per call
+CREATE_TABLE_SQL = sql.SQL("CREATE TABLE IF NOT EXISTS {} ()")
+CREATE_VIEW_SQL = sql.SQL("CREATE OR REPLACE VIEW {} AS {}")
+ALTER_TABLE_SQL = sql.SQL("ALTER TABLE {} {}")
+ADD_COLUMN_SQL = sql.SQL("ADD COLUMN IF NOT EXISTS {} {}")
+BINARY_COPY_SQL = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT BINARY)")
+CSV_COPY_SQL = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT CSV, DELIMITER E'\\t', NULL '\\N')")
+INSERT_VALUES_SQL = sql.SQL("INSERT INTO {} ({}) VALUES %s")
+INSERT_ROW_SQL = sql.SQL("INSERT INTO {} ({}) VALUES ({})")
+CREATE_STAGING_SQL = sql.SQL("CREATE TEMPORARY TABLE {} (LIKE {}) ON COMMIT DROP")
+INSERT_FROM_STAGING_SQL = sql.SQL("INSERT INTO {} ({}) SELECT {} FROM {}")
+PREPARE_SQL = sql.SQL("PREPARE {} AS {}")
+EXECUTE_SQL = sql.SQL("EXECUTE {} ({})")
+SQL_LIST_SEPARATOR = sql.SQL(', ')
+
+def _table_identifier(table_name):
+    # Allow schema-qualified names such as "schema.table"
+    return sql.Identifier(*table_name.split('.'))
+
 def create_table(connection, table_name):
     """Create a new table if it does not exist."""
     try:
         cursor = connection.cursor()
-        create_table_query = f"CREATE TABLE IF NOT EXISTS {AsIs(table_name)} ();"
+        create_table_query = CREATE_TABLE_SQL.format(_table_identifier(table_name))
         cursor.execute(create_table_query)
         connection.commit()
         cursor.close()
@@ -220,30 +471,245 @@ def create_table(connection, table_name):
         logger.error(f"Error in creating table: {error}")
         raise
 
-def populate_table(connection, table_name, dataframe):
+def _existing_columns(cursor, table_name):
+    """Return a {column_name: data_type} mapping for an existing table."""
+    # Resolve the name through the search_path exactly as the COPY and INSERT statements do
+    cursor.execute(
+        "SELECT attname, format_type(atttypid, atttypmod) FROM pg_attribute "
+        "WHERE attrelid = to_regclass(%s) AND attnum > 0 AND NOT attisdropped",
+        (_table_identifier(table_name).as_string(cursor),)
+    )
+    return dict(cursor.fetchall())
+
+# numpy layout of each fixed-width PostgreSQL type in the binary COPY format
+BINARY_COPY_FORMATS = {
+    'BOOLEAN': '?',
+    'BIGINT': '>i8',
+    'DOUBLE PRECISION': '>f8',
+    'TIMESTAMP': '>i8',
+}
+PGCOPY_HEADER = b'PGCOPY\n\xff\r\n\x00' + struct.pack('>ii', 0, 0)
+PGCOPY_TRAILER = struct.pack('>h', -1)
+# PostgreSQL timestamps count microseconds from 2000-01-01
+PG_EPOCH_MICROSECONDS = 946684800 * 1_000_000
+
+def _supports_binary_copy(dataframe, existing_columns):
+    """Binary COPY needs null-free fixed-width columns whose table types match exactly."""
+    for col in dataframe.columns:
+        dtype = dataframe[col].dtype
+        pg_type = _pg_type_for(dtype)
+        if pg_type not in BINARY_COPY_FORMATS:
+            return False
+        # uint64 can exceed BIGINT; let the server range-check it through CSV instead
+        if dtype.kind == 'u' and dtype.itemsize == 8:
+            return False
+        existing_type = existing_columns.get(col)
+        if existing_type is not None and existing_type.upper().replace(' WITHOUT TIME ZONE', '') != pg_type:
+            return False
+    return not dataframe.isna().to_numpy().any()
+
+def _binary_copy(cursor, table, columns, dataframe):
+    """COPY a DataFrame into the table using PostgreSQL's binary tuple format."""
+    fields = [('field_count', '>i2')]
+    for i, col in enumerate(dataframe.columns):
+        fields += [(f'length{i}', '>i4'), (f'value{i}', BINARY_COPY_FORMATS[_pg_type_for(dataframe[col].dtype)])]
+
+    # One structured record per row: field count, then a length and value per column
+    records = np.empty(len(dataframe), dtype=fields)
+    records['field_count'] = len(dataframe.columns)
+    for i, col in enumerate(dataframe.columns):
+        value_dtype = records.dtype[f'value{i}']
+        if _pg_type_for(dataframe[col].dtype) == 'TIMESTAMP':
+            values = dataframe[col].to_numpy('datetime64[us]').astype('int64') - PG_EPOCH_MICROSECONDS
+        else:
+            values = dataframe[col].to_numpy(dtype=value_dtype)
+        records[f'length{i}'] = value_dtype.itemsize
+        records[f'value{i}'] = values
+
+    buffer = io.BytesIO()
+    buffer.write(PGCOPY_HEADER)
+    buffer.write(records.tobytes())
+    buffer.write(PGCOPY_TRAILER)
+    buffer.seek(0)
+    copy_query = BINARY_COPY_SQL.format(table, columns)
+    cursor.copy_expert(copy_query, buffer)
+
+def _csv_copy(cursor, table, columns, dataframe):
+    """COPY a DataFrame into the table as CSV text streamed through a pipe."""
+    read_fd, write_fd = os.pipe()
+    reader = os.fdopen(read_fd, 'r', encoding='utf-8', newline='')
+    writer = os.fdopen(write_fd, 'w', encoding='utf-8', newline='')
+    producer_errors = []
+
+    def produce():
+        try:
+            with writer:
+                dataframe.to_csv(writer, index=False, header=False, sep='\t', na_rep='\\N')
+        except BrokenPipeError:
+            # COPY stopped reading; its own error is raised in the calling thread
+            pass
+        except Exception as error:
+            producer_errors.append(error)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        with reader:
+            cursor.copy_expert(CSV_COPY_SQL.format(table, columns), reader)
+    finally:
+        producer.join()
+    if producer_errors:
+        # The rows sent before the failure are discarded when the caller rolls back
+        raise producer_errors[0]
+
+# Smallest DataFrame worth splitting across several COPY connections
+PARALLEL_COPY_MIN_ROWS = 100_000
+
+def _worker_connections(connection, count):
+    """Open count new connections to the same database and search_path as connection."""
+    with connection.cursor() as cursor:
+        cursor.execute("SHOW search_path")
+        search_path = cursor.fetchone()[0]
+    params = connection.info.dsn_parameters
+    escaped_search_path = search_path.replace('\\', '\\\\').replace(' ', '\\ ')
+    params['options'] = f"{params.get('options', '')} -c search_path={escaped_search_path}".strip()
+
+    connections = []
+    try:
+        for _ in range(count):
+            connections.append(psycopg2.connect(password=connection.info.password, **params))
+    except (Exception, psycopg2.DatabaseError):
+        for worker_connection in connections:
+            worker_connection.close()
+        raise
+    return connections
+
+def _copy_chunk(copy, connection, table, columns, chunk, synchronous_commit):
+    with connection.cursor() as cursor:
+        if not synchronous_commit:
+            cursor.execute("SET LOCAL synchronous_commit TO off")
+        copy(cursor, table, columns, chunk)
+
+def _parallel_copy(copy, connection, table, columns, dataframe, workers, synchronous_commit):
+    """COPY row slices of the DataFrame concurrently and commit them only if every slice succeeded."""
+    bounds = np.linspace(0, len(dataframe), workers + 1, dtype=int)
+    chunks = [dataframe.iloc[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+    # Open every worker connection before sending any rows
+    worker_connections = _worker_connections(connection, workers)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(lambda args: _copy_chunk(copy, args[0], table, columns, args[1],
+                                                              synchronous_commit),
+                              zip(worker_connections, chunks)))
+        for worker_connection in worker_connections:
+            worker_connection.commit()
+    except (Exception, psycopg2.DatabaseError):
+        for worker_connection in worker_connections:
+            worker_connection.rollback()
+        raise
+    finally:
+        for worker_connection in worker_connections:
+            worker_connection.close()
+
+def _row_tuples(dataframe):
+    """Yield DataFrame rows as tuples of Python objects that psycopg2 can adapt."""
+    rows = dataframe.astype(object)
+    # Store NaN, NaT and NA as NULL, the same as the COPY path does
+    rows = rows.where(rows.notna(), None)
+    return rows.itertuples(index=False, name=None)
+
+POPULATE_MODES = ('copy', 'values', 'executemany', 'prepared')
+
+# Names of the INSERT statements already prepared on each live connection
+_prepared_statements = weakref.WeakKeyDictionary()
+
+def _prepared_insert(cursor, table, columns, column_types):
+    """PREPARE an INSERT for this table, column list and column types once per connection and return its name."""
+    parameters = SQL_LIST_SEPARATOR.join(sql.SQL(f"${i}") for i in range(1, len(column_types) + 1))
+    insert_query = INSERT_ROW_SQL.format(table, columns, parameters).as_string(cursor)
+    # The parameter types are fixed at PREPARE time, so a retyped table needs a new statement
+    statement_key = "\n".join([insert_query, *column_types])
+    statement_name = f"sonnixgres_insert_{hashlib.md5(statement_key.encode()).hexdigest()}"
+
+    prepared = _prepared_statements.setdefault(cursor.connection, set())
+    if statement_name not in prepared:
+        cursor.execute(PREPARE_SQL.format(sql.Identifier(statement_name), sql.SQL(insert_query)))
+        prepared.add(statement_name)
+    return statement_name
+
+def populate_table(connection, table_name, dataframe, populate_mode='copy', unlogged_staging=False,
+                   workers=1, synchronous_commit=True):
     """Populate the table with data from a DataFrame."""
+    if populate_mode not in POPULATE_MODES:
+        raise ValueError(f"Invalid populate mode: {populate_mode}. Valid options are: {list(POPULATE_MODES)}")
+
     try:
         cursor = connection.cursor()
-
-        # Add columns based on DataFrame, one at a time
-        for col in dataframe.columns:
-            alter_table_query = f"ALTER TABLE {AsIs(table_name)} ADD COLUMN IF NOT EXISTS {col} TEXT;"
+        table = _table_identifier(table_name)
+        columns = SQL_LIST_SEPARATOR.join(map(sql.Identifier, dataframe.columns))
+
+        if not synchronous_commit:
+            # Don't wait for the WAL flush when this load commits
+            cursor.execute("SET LOCAL synchronous_commit TO off")
+
+        # Add any missing DataFrame columns with a single ALTER TABLE, typed from their dtypes
+        existing_columns = _existing_columns(cursor, table_name)
+        missing_columns = [col for col in dataframe.columns if col not in existing_columns]
+        if missing_columns:
+            alter_table_query = ALTER_TABLE_SQL.format(table, SQL_LIST_SEPARATOR.join(
+                ADD_COLUMN_SQL.format(sql.Identifier(col), sql.SQL(_pg_type_for(dataframe[col].dtype)))
+                for col in missing_columns
+            ))
             cursor.execute(alter_table_query)
 
-        # Insert data
-        insert_columns = ', '.join(dataframe.columns)
-        insert_values = ', '.join(['%s'] * len(dataframe.columns))
-        insert_query = f"INSERT INTO {AsIs(table_name)} ({insert_columns}) VALUES ({insert_values})"
-        cursor.executemany(insert_query, dataframe.values.tolist())
+        target = table
+        if unlogged_staging:
+            target = sql.Identifier(f"_stg_{table_name.split('.')[-1]}")
+            cursor.execute(CREATE_STAGING_SQL.format(target, table))
+
+        if populate_mode == 'copy':
+            # Stream the data through a single COPY instead of one INSERT per row,
+            # skipping text encoding entirely when every column is fixed-width
+            copy = _binary_copy if _supports_binary_copy(dataframe, existing_columns) else _csv_copy
+            if workers > 1 and not unlogged_staging and len(dataframe) >= PARALLEL_COPY_MIN_ROWS:
+                # The worker connections must see any columns added above
+                connection.commit()
+                _parallel_copy(copy, connection, table, columns, dataframe, workers, synchronous_commit)
+            else:
+                copy(cursor, target, columns, dataframe)
+        elif populate_mode == 'values':
+            # Send up to page_size rows per INSERT ... VALUES statement
+            insert_query = INSERT_VALUES_SQL.format(target, columns)
+            template = "(" + ", ".join(["%s"] * len(dataframe.columns)) + ")"
+            execute_values(cursor, insert_query, _row_tuples(dataframe),
+                           template=template, page_size=1000)
+        elif populate_mode == 'prepared':
+            # Skip parsing and planning the INSERT for every batch
+            column_types = [existing_columns.get(col) or _pg_type_for(dataframe[col].dtype)
+                            for col in dataframe.columns]
+            statement_name = _prepared_insert(cursor, target, columns, column_types)
+            execute_query = EXECUTE_SQL.format(
+                sql.Identifier(statement_name),
+                SQL_LIST_SEPARATOR.join([sql.Placeholder()] * len(dataframe.columns)))
+            execute_batch(cursor, execute_query, _row_tuples(dataframe),
+                          page_size=1000)
+        else:
+            insert_values = SQL_LIST_SEPARATOR.join([sql.Placeholder()] * len(dataframe.columns))
+            insert_query = INSERT_ROW_SQL.format(target, columns, insert_values)
+            cursor.executemany(insert_query, _row_tuples(dataframe))
+
+        if unlogged_staging:
+            cursor.execute(INSERT_FROM_STAGING_SQL.format(table, columns, columns, target))
         connection.commit()
         cursor.close()
         logger.info(f"Data inserted into table '{table_name}' successfully.")
     except (Exception, psycopg2.DatabaseError) as error:
+        connection.rollback()
         logger.error(f"Error in populating table: {error}")
         raise
 
 def update_records(connection: psycopg2.connect, update_query: str, 
-                   params: tuple | None = None, close_connection: bool = True) -> None:
+                   params: tuple | None = None, close_connection: bool = False) -> None:
     if not connection:
         raise ConnectionError("No connection to database.")
 
@@ -262,13 +728,13 @@ def update_records(connection: psycopg2.connect, update_query: str,
             logger.info("Database connection closed.")
 
 def create_view(connection: psycopg2.connect, view_name: str, view_query: str, 
-                close_connection: bool = True) -> None:
+                close_connection: bool = False) -> None:
     if not connection:
         raise ConnectionError("No connection to database.")
 
     try:
         with connection.cursor() as cursor:
-            create_view_query = f"CREATE OR REPLACE VIEW {AsIs(view_name)} AS {view_query}"
+            create_view_query = CREATE_VIEW_SQL.format(_table_identifier(view_name), sql.SQL(view_query))
             cursor.execute(create_view_query)
             connection.commit()
             logger.info(f"View '{view_name}' created successfully.")
@@ -1,10 +1,18 @@
 # test_sonnixgres.py
+import threading
 import pytest
 import pandas as pd
-from sonnixgres import create_connection, create_table, populate_table, query_database, update_records, create_view, display_results_as_table, save_results_to_csv
+import psycopg2
+from psycopg2 import sql
+from sonnixgres import create_connection, close_pool, create_table, populate_table, query_database, PARALLEL_COPY_MIN_ROWS, query_database_arrow, update_records, create_view, display_results_as_table, save_results_to_csv
 
 # Constants for testing
 TABLE_NAME = "test_table"
+TYPED_TABLE_NAME = "test_typed_table"
+POOL_TABLE_NAME = "test_pool_table"
+PARALLEL_TABLE_NAME = "test_parallel_table"
+PARALLEL_SCHEMA_NAME = "test_parallel_schema"
+SEARCH_PATH_TABLE_NAME = "test_search_path_table"
 VIEW_NAME = "test_view"
 CSV_FILENAME = "test_output.csv"
 DISPLAY_LIMIT = 50
@@ -25,6 +33,57 @@ def db_connection():
     yield connection
     connection.close()
 
+def test_connection_pool_reuses_connections():
+    connection = create_connection()
+    backend_pid = connection.get_backend_pid()
+    connection.close()
+    with create_connection() as reused_connection:
+        assert reused_connection.get_backend_pid() == backend_pid
+
+def test_connection_pool_keeps_concurrent_connections_open():
+    connections = [create_connection() for _ in range(3)]
+    backend_pids = {connection.get_backend_pid() for connection in connections}
+    for connection in connections:
+        connection.close()
+    connections = [create_connection() for _ in range(3)]
+    assert {connection.get_backend_pid() for connection in connections} == backend_pids
+    for connection in connections:
+        connection.close()
+
+def test_connection_pool_waits_for_a_returned_connection():
+    connections = [create_connection() for _ in range(10)]
+    threading.Timer(0.2, connections.pop().close).start()
+    extra_connection = create_connection()
+    assert not extra_connection.closed
+    for connection in [extra_connection, *connections]:
+        connection.close()
+
+def test_closed_pooled_connection_is_unusable():
+    connection = create_connection()
+    connection.close()
+    with pytest.raises(psycopg2.InterfaceError):
+        connection.cursor()
+    with pytest.raises(psycopg2.InterfaceError):
+        connection.commit()
+
+def test_pooled_connection_is_a_psycopg2_connection():
+    with create_connection() as connection:
+        assert isinstance(connection, psycopg2.extensions.connection)
+        assert sql.Identifier(TABLE_NAME).as_string(connection) == f'"{TABLE_NAME}"'
+
+def test_pooled_connection_context_manager_commits():
+    with create_connection() as connection:
+        connection.cursor().execute(f'CREATE TABLE IF NOT EXISTS {POOL_TABLE_NAME} (id INT)')
+        connection.cursor().execute(f'INSERT INTO {POOL_TABLE_NAME} VALUES (1)')
+    with pytest.raises(ZeroDivisionError):
+        with create_connection() as connection:
+            connection.cursor().execute(f'INSERT INTO {POOL_TABLE_NAME} VALUES (2)')
+            1 / 0
+    with create_connection() as connection:
+        df = query_database(connection, f'SELECT id FROM {POOL_TABLE_NAME} WHERE id IN (1, 2)')
+        connection.cursor().execute(f'DROP TABLE {POOL_TABLE_NAME}')
+    assert df['id'].tolist() == [1]
+
 def test_create_table(db_connection):
     create_table(db_connection, TABLE_NAME)
     # Add further assertions as needed
@@ -33,10 +92,176 @@ def test_populate_table(db_connection, dummy_dataframe):
     populate_table(db_connection, TABLE_NAME, dummy_dataframe)
     # Add further assertions as needed
 
+def count_rows(connection, table_name):
+    return query_database(connection, f'SELECT COUNT(*) AS n FROM {table_name}')['n'].iloc[0]
+
+def test_populate_table_values_mode(db_connection, dummy_dataframe):
+    rows_before = count_rows(db_connection, TABLE_NAME)
+    populate_table(db_connection, TABLE_NAME, dummy_dataframe, populate_mode='values')
+    assert count_rows(db_connection, TABLE_NAME) == rows_before + len(dummy_dataframe)
+
+def test_populate_table_prepared_mode(db_connection, dummy_dataframe):
+    rows_before = count_rows(db_connection, TABLE_NAME)
+    populate_table(db_connection, TABLE_NAME, dummy_dataframe, populate_mode='prepared')
+    prepared_query = (f"SELECT name FROM pg_prepared_statements "
+                      f"WHERE statement LIKE '%INSERT INTO \"{TABLE_NAME}\"%'")
+    prepared_before = query_database(db_connection, prepared_query)
+    populate_table(db_connection, TABLE_NAME, dummy_dataframe, populate_mode='prepared')
+    prepared_after = query_database(db_connection, prepared_query)
+    assert len(prepared_before) == 1
+    assert prepared_after['name'].tolist() == prepared_before['name'].tolist()
+    assert count_rows(db_connection, TABLE_NAME) == rows_before + 2 * len(dummy_dataframe)
+
+def test_populate_table_prepared_mode_after_table_is_retyped(db_connection):
+    update_records(db_connection, f'DROP TABLE IF EXISTS {TYPED_TABLE_NAME}')
+    update_records(db_connection, f'CREATE TABLE {TYPED_TABLE_NAME} (id BIGINT)')
+    populate_table(db_connection, TYPED_TABLE_NAME, pd.DataFrame({'id': [1]}), populate_mode='prepared')
+    update_records(db_connection, f'DROP TABLE {TYPED_TABLE_NAME}')
+    update_records(db_connection, f'CREATE TABLE {TYPED_TABLE_NAME} (id TEXT)')
+    populate_table(db_connection, TYPED_TABLE_NAME, pd.DataFrame({'id': ['a']}), populate_mode='prepared')
+    df = query_database(db_connection, f'SELECT id FROM {TYPED_TABLE_NAME}')
+    update_records(db_connection, f'DROP TABLE {TYPED_TABLE_NAME}')
+    assert df['id'].tolist() == ['a']
+
+def test_populate_table_unlogged_staging(db_connection, dummy_dataframe):
+    rows_before = count_rows(db_connection, TABLE_NAME)
+    populate_table(db_connection, TABLE_NAME, dummy_dataframe, unlogged_staging=True,
+                   synchronous_commit=False)
+    assert count_rows(db_connection, TABLE_NAME) == rows_before + len(dummy_dataframe)
+    staging_tables = query_database(db_connection, f"SELECT to_regclass('_stg_{TABLE_NAME}') AS staging")
+    assert staging_tables['staging'].isna().all()
+
+@pytest.mark.parametrize('populate_mode', ['values', 'executemany', 'prepared'])
+def test_populate_table_extension_dtypes(db_connection, populate_mode):
+    update_records(db_connection, f'DROP TABLE IF EXISTS {TYPED_TABLE_NAME}')
+    create_table(db_connection, TYPED_TABLE_NAME)
+    extension_dataframe = pd.DataFrame({
+        'id': pd.array([1, 2], dtype='Int64'),
+        'name': pd.array(['a', 'b'], dtype='string')
+    })
+    populate_table(db_connection, TYPED_TABLE_NAME, extension_dataframe, populate_mode=populate_mode)
+    df = query_database(db_connection, f'SELECT id, name FROM {TYPED_TABLE_NAME} ORDER BY id')
+    update_records(db_connection, f'DROP TABLE {TYPED_TABLE_NAME}')
+    assert df['id'].tolist() == [1, 2]
+    assert df['name'].tolist() == ['a', 'b']
+
+@pytest.mark.parametrize('populate_mode', ['copy', 'values', 'executemany', 'prepared'])
+def test_populate_table_stores_missing_values_as_null(db_connection, populate_mode):
+    update_records(db_connection, f'DROP TABLE IF EXISTS {TYPED_TABLE_NAME}')
+    create_table(db_connection, TYPED_TABLE_NAME)
+    missing_dataframe = pd.DataFrame({
+        'score': [1.5, float('nan')],
+        'id': pd.array([1, None], dtype='Int64'),
+        'created': pd.to_datetime(['2024-01-01', None])
+    })
+    populate_table(db_connection, TYPED_TABLE_NAME, missing_dataframe, populate_mode=populate_mode)
+    df = query_database(db_connection, f'SELECT COUNT(*) FILTER (WHERE score IS NULL AND id IS NULL '
+                                       f'AND created IS NULL) AS n FROM {TYPED_TABLE_NAME}')
+    update_records(db_connection, f'DROP TABLE {TYPED_TABLE_NAME}')
+    assert df['n'].iloc[0] == 1
+
+@pytest.mark.parametrize('populate_mode', ['copy', 'values', 'executemany', 'prepared'])
+def test_populate_table_keeps_timezone_offsets(db_connection, populate_mode):
+    update_records(db_connection, f'DROP TABLE IF EXISTS {TYPED_TABLE_NAME}')
+    create_table(db_connection, TYPED_TABLE_NAME)
+    aware_dataframe = pd.DataFrame({'created': pd.to_datetime(['2024-01-01 12:00+05:00'])})
+    populate_table(db_connection, TYPED_TABLE_NAME, aware_dataframe, populate_mode=populate_mode)
+    df = query_database(db_connection, f"SELECT created AT TIME ZONE 'UTC' AS created FROM {TYPED_TABLE_NAME}")
+    update_records(db_connection, f'DROP TABLE {TYPED_TABLE_NAME}')
+    assert df['created'].tolist() == [pd.Timestamp('2024-01-01 07:00')]
+
+def test_populate_table_invalid_mode(db_connection, dummy_dataframe):
+    with pytest.raises(ValueError):
+        populate_table(db_connection, TABLE_NAME, dummy_dataframe, populate_mode='bogus')
+
+def test_populate_table_typed_dataframe(db_connection):
+    typed_dataframe = pd.DataFrame({
+        'id': range(DISPLAY_LIMIT),
+        'score': [i / 2 for i in range(DISPLAY_LIMIT)],
+        'created': pd.date_range('2024-01-01', periods=DISPLAY_LIMIT, freq='D')
+    })
+    create_table(db_connection, TYPED_TABLE_NAME)
+    populate_table(db_connection, TYPED_TABLE_NAME, typed_dataframe)
+    df = query_database(db_connection, f'SELECT * FROM {TYPED_TABLE_NAME} ORDER BY id')
+    assert df['score'].iloc[-1] == (DISPLAY_LIMIT - 1) / 2
+    assert df['created'].iloc[0] == pd.Timestamp('2024-01-01')
+
+def test_populate_table_parallel_copy(db_connection):
+    parallel_dataframe = pd.DataFrame({'id': range(PARALLEL_COPY_MIN_ROWS)})
+    update_records(db_connection, f'DROP TABLE IF EXISTS {PARALLEL_TABLE_NAME}')
+    create_table(db_connection, PARALLEL_TABLE_NAME)
+    populate_table(db_connection, PARALLEL_TABLE_NAME, parallel_dataframe, workers=12)
+    df = query_database(db_connection, f'SELECT COUNT(*) AS n, SUM(id) AS total FROM {PARALLEL_TABLE_NAME}')
+    assert df['n'].iloc[0] == PARALLEL_COPY_MIN_ROWS
+    assert df['total'].iloc[0] == sum(range(PARALLEL_COPY_MIN_ROWS))
+
+def test_populate_table_parallel_copy_failure_loads_nothing(db_connection):
+    update_records(db_connection, f'DROP TABLE IF EXISTS {PARALLEL_TABLE_NAME}')
+    update_records(db_connection, f'CREATE TABLE {PARALLEL_TABLE_NAME} (id BIGINT)')
+    bad_dataframe = pd.DataFrame({'id': [str(i) for i in range(PARALLEL_COPY_MIN_ROWS - 1)] + ['x']})
+    with pytest.raises(psycopg2.DataError):
+        populate_table(db_connection, PARALLEL_TABLE_NAME, bad_dataframe, workers=4)
+    df = query_database(db_connection, f'SELECT COUNT(*) AS n FROM {PARALLEL_TABLE_NAME}')
+    assert df['n'].iloc[0] == 0
+
+def test_populate_table_parallel_copy_uses_callers_search_path(db_connection):
+    update_records(db_connection, f'CREATE SCHEMA IF NOT EXISTS {PARALLEL_SCHEMA_NAME}')
+    update_records(db_connection, f'DROP TABLE IF EXISTS {PARALLEL_SCHEMA_NAME}.{PARALLEL_TABLE_NAME}')
+    update_records(db_connection, f'CREATE TABLE {PARALLEL_SCHEMA_NAME}.{PARALLEL_TABLE_NAME} ()')
+    dsn = db_connection.info.dsn_parameters
+    other_connection = psycopg2.connect(password=db_connection.info.password,
+                                        **{**dsn, 'options': f'-c search_path={PARALLEL_SCHEMA_NAME}'})
+    try:
+        populate_table(other_connection, PARALLEL_TABLE_NAME,
+                       pd.DataFrame({'far': range(PARALLEL_COPY_MIN_ROWS)}), workers=3)
+        df = query_database(other_connection, f'SELECT COUNT(*) AS n FROM {PARALLEL_TABLE_NAME}')
+    finally:
+        other_connection.close()
+    assert df['n'].iloc[0] == PARALLEL_COPY_MIN_ROWS
+
+def test_populate_table_finds_table_later_in_search_path(db_connection):
+    update_records(db_connection, f'CREATE SCHEMA IF NOT EXISTS {PARALLEL_SCHEMA_NAME}')
+    update_records(db_connection, f'DROP TABLE IF EXISTS {PARALLEL_SCHEMA_NAME}.{SEARCH_PATH_TABLE_NAME}')
+    update_records(db_connection, f'CREATE TABLE {PARALLEL_SCHEMA_NAME}.{SEARCH_PATH_TABLE_NAME} (id INTEGER)')
+    dsn = db_connection.info.dsn_parameters
+    other_connection = psycopg2.connect(password=db_connection.info.password,
+                                        **{**dsn, 'options': f'-c search_path=public,{PARALLEL_SCHEMA_NAME}'})
+    try:
+        populate_table(other_connection, SEARCH_PATH_TABLE_NAME, pd.DataFrame({'id': [1, 2]}))
+        df = query_database(other_connection, f'SELECT id FROM {SEARCH_PATH_TABLE_NAME} ORDER BY id')
+    finally:
+        other_connection.close()
+    update_records(db_connection, f'DROP TABLE {PARALLEL_SCHEMA_NAME}.{SEARCH_PATH_TABLE_NAME}')
+    assert df['id'].tolist() == [1, 2]
+
+def test_populate_table_rejects_out_of_range_uint64(db_connection):
+    update_records(db_connection, f'DROP TABLE IF EXISTS {TYPED_TABLE_NAME}')
+    create_table(db_connection, TYPED_TABLE_NAME)
+    unsigned_dataframe = pd.DataFrame({'id': pd.array([1, 2**63 + 5], dtype='uint64')})
+    with pytest.raises(psycopg2.DataError):
+        populate_table(db_connection, TYPED_TABLE_NAME, unsigned_dataframe)
+    update_records(db_connection, f'DROP TABLE {TYPED_TABLE_NAME}')
+
 def test_query_database(db_connection):
     df = query_database(db_connection, f'SELECT * FROM {TABLE_NAME}')
     assert not df.empty, "Query should return data"
 
+def test_query_database_statements_without_server_side_cursor(db_connection):
+    assert not query_database(db_connection, 'SHOW search_path').empty
+    assert not query_database(db_connection, f'EXPLAIN SELECT * FROM {TABLE_NAME}').empty
+    df = query_database(db_connection, 'WITH x AS (SELECT 1 AS a) SELECT * FROM x')
+    assert df['a'].tolist() == [1]
+
+def test_query_database_connection_usable_after_error(db_connection):
+    with pytest.raises(psycopg2.errors.UndefinedTable):
+        query_database(db_connection, 'SELECT * FROM no_such_table')
+    df = query_database(db_connection, 'SELECT 1 AS a')
+    assert df['a'].tolist() == [1]
+
+def test_query_database_arrow():
+    df = query_database_arrow(f'SELECT * FROM {TABLE_NAME}')
+    assert not df.empty, "Query should return data"
+
 def test_update_records(db_connection):
     update_query = f'UPDATE {TABLE_NAME} SET column1 = %s WHERE column2 = %s'
     update_records(db_connection, update_query, ('updated_data', 'more_data1'))
@@ -55,4 +280,10 @@ def test_save_results_to_csv(dummy_dataframe):
     save_results_to_csv(dummy_dataframe, CSV_FILENAME)
     # Add further assertions as needed
 
+def test_close_pool():
+    close_pool()
+    connection = create_connection()
+    assert not connection.closed
+    connection.close()
+
 # Add additional cleanup steps if needed